@@ -38,7 +38,8 @@ class DiffusersBackend(Backend):
     )
     attention_slice_size: IntProperty(name="Attention Slice Size", default=1, min=1)
     cudnn_benchmark: BoolProperty(name="cuDNN Benchmark", description="Allows cuDNN to benchmark multiple convolution algorithms and select the fastest", default=False)
-    tf32: BoolProperty(name="TF32", description="Utilizes tensor cores on Ampere (RTX 30xx) or newer GPUs for matrix multiplications.\nHas no effect if half precision is enabled", default=False)
+    tf32: BoolProperty(name="TF32", description="Utilizes tensor cores on Ampere (RTX 30xx) or newer GPUs for matrix multiplications.\nHas no effect if half precision is enabled", default=True)
+    cudnn_tf32: BoolProperty(name="cuDNN TF32", description="Utilizes tensor cores on Ampere (RTX 30xx) or newer GPUs for convolutions.\nHas no effect if half precision is enabled", default=True)
     half_precision: BoolProperty(name="Half Precision", description="Reduces memory usage and increases speed in exchange for a slight loss in image quality.\nHas no effect if CPU only is enabled or using a GTX 16xx GPU", default=True)
     cpu_offload: EnumProperty(
         name="CPU Offload",
@@ -50,7 +51,18 @@ class DiffusersBackend(Backend):
         default=0,
         description="Dynamically moves models in and out of device memory for reduced memory usage with reduced speed"
     )
-    channels_last_memory_format: BoolProperty(name="Channels Last Memory Format", description="An alternative way of ordering NCHW tensors that may be faster or slower depending on the device", default=False)
+    cpu_offload_prefetch: BoolProperty(name="Prefetch Offloaded Weights", description="Copies the next UNet block onto the GPU while the current one runs, reducing the speed penalty of submodule offloading", default=True)
+    channels_last_memory_format: EnumProperty(
+        name="Channels Last Memory Format",
+        items=(
+            ("auto", "Auto", "Enabled when using half precision on RTX 20xx or newer GPUs", 0),
+            ("on", "On", "", 1),
+            ("off", "Off", "", 2)
+        ),
+        default=0,
+        description="An alternative way of ordering NCHW tensors that may be faster or slower depending on the device.\n"
+                    "Defaults to Auto, which enables it where it is known to be faster"
+    )
     sdp_attention: BoolProperty(
         name="SDP Attention",
         description="Scaled dot product attention requires less memory and often comes with a good speed increase.\n"
@@ -73,6 +85,8 @@ class DiffusersBackend(Backend):
     )
     vae_tile_size: IntProperty(name="VAE Tile Size", min=1, default=512, description="Width and height measurement of tiles. Smaller sizes are more likely to cause inaccurate colors and other undesired artifacts")
     vae_tile_blend: IntProperty(name="VAE Tile Blend", min=0, default=64, description="Minimum amount of how much each edge of a tile will intersect its adjacent tile")
+    deep_cache: BoolProperty(name="DeepCache", description="Reuses the deeper UNet features between steps and only recomputes the outer layers.\nSignificantly faster in exchange for some loss in detail. Has no effect with fewer than 6 steps", default=False)
+    deep_cache_interval: IntProperty(name="DeepCache Interval", min=2, default=2, description="Number of steps between full UNet evaluations. Higher is faster but less accurate")
     cfg_end: FloatProperty(name="CFG End", min=0, max=1, default=1, description="The percentage of steps to complete before disabling classifier-free guidance")
     cpu_only: BoolProperty(name="CPU Only", default=False, description="Disables GPU acceleration and is extremely slow")
 
@@ -293,8 +307,12 @@ The selected model is for {model.model_type.name.replace('_', ' ').lower()}."""
 
         optimization("cudnn_benchmark")
         optimization("tf32")
+        optimization("cudnn_tf32")
         optimization("half_precision")
         optimization("channels_last_memory_format")
+        optimization("deep_cache")
+        if self.deep_cache:
+            optimization("deep_cache_interval")
         optimization("batch_size")
     
     def draw_memory_optimizations(self, layout, context):
@@ -312,6 +330,8 @@ The selected model is for {model.model_type.name.replace('_', ' ').lower()}."""
         if self.attention_slice_size_src == 'manual':
             slice_size_row.prop(self, "attention_slice_size", text="Size")
         optimization("cpu_offload")
+        if self.cpu_offload == "submodule":
+            optimization("cpu_offload_prefetch")
         optimization("cpu_only")
         optimization("vae_slicing")
         optimization("vae_tiling")
@@ -20,7 +20,7 @@ class RunInSubprocess(Exception):
         if is_actor_process:
             return func
         def wrapper(*args, **kwargs):
-            return Generator.shared().call(wrapper, *args, **kwargs).result()
+            return Generator.shared().call(wrapper, *args, _block=True, **kwargs).result()
         RunInSubprocess._copy_attributes(func, wrapper)
         return wrapper
 
@@ -35,7 +35,7 @@ class RunInSubprocess(Exception):
                 return func
             def wrapper(*args, **kwargs):
                 if condition(*args, **kwargs):
-                    return Generator.shared().call(wrapper, *args, **kwargs).result()
+                    return Generator.shared().call(wrapper, *args, _block=True, **kwargs).result()
                 return func(*args, **kwargs)
             RunInSubprocess._copy_attributes(func, wrapper)
             return wrapper
@@ -49,7 +49,7 @@ class RunInSubprocess(Exception):
             try:
                 return func(*args, **kwargs)
             except RunInSubprocess:
-                return Generator.shared().call(wrapper, *args, **kwargs).result()
+                return Generator.shared().call(wrapper, *args, _block=True, **kwargs).result()
         RunInSubprocess._copy_attributes(func, wrapper)
         return wrapper
 
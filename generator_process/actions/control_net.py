@@ -127,7 +127,8 @@ def control_net(
         def callback(pipe, step, timestep, callback_kwargs):
             if future.check_cancelled():
                 raise InterruptedError()
-            future.add_response(step_latents(pipe, step_preview_mode, callback_kwargs["latents"], generator, step, steps))
+            if (preview := step_latents(pipe, step_preview_mode, callback_kwargs["latents"], generator, step, steps)) is not None:
+                future.add_response(preview)
             return callback_kwargs
         try:
             if image is not None:
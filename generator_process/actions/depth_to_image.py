@@ -219,6 +219,8 @@ def depth_to_image(
             timesteps = self.scheduler.timesteps
             if image is not None:
                 timesteps, num_inference_steps = self.get_timesteps(num_inference_steps, strength, device)
+            # matches diffusers pipelines, so step previews know which step is the last one
+            self._num_timesteps = len(timesteps)
 
             # 6. Prepare latent variables
             num_channels_latents = self.vae.config.latent_channels
@@ -272,14 +274,21 @@ def depth_to_image(
 
             # 10. Denoising loop
             num_warmup_steps = len(timesteps) - num_inference_steps * self.scheduler.order
+            # the model input is reused between steps, depth doesn't change so it only needs to be copied in once
+            latent_model_input = torch.empty(
+                (depth.shape[0], num_channels_latents + num_channels_depth, *latents.shape[2:]),
+                dtype=latents.dtype,
+                device=latents.device
+            )
+            latent_model_input[:, num_channels_latents:].copy_(depth)
             with self.progress_bar(total=num_inference_steps) as progress_bar:
                 for i, t in enumerate(timesteps):
                     # expand the latents if we are doing classifier free guidance
-                    latent_model_input = torch.cat([latents] * 2) if do_classifier_free_guidance else latents
-
-                    # concat latents, mask, masked_image_latents in the channel dimension
-                    latent_model_input = self.scheduler.scale_model_input(latent_model_input, t)
-                    latent_model_input = torch.cat([latent_model_input, depth], dim=1)
+                    # and concat latents, depth in the channel dimension
+                    scaled_latents = self.scheduler.scale_model_input(latents, t)
+                    latent_model_input[:latents.shape[0], :num_channels_latents].copy_(scaled_latents)
+                    if do_classifier_free_guidance:
+                        latent_model_input[latents.shape[0]:, :num_channels_latents].copy_(scaled_latents)
 
                     # predict the noise residual
                     noise_pred = self.unet(latent_model_input, t, encoder_hidden_states=text_embeddings).sample
@@ -369,7 +378,8 @@ def depth_to_image(
         def callback(step, _, latents):
             if future.check_cancelled():
                 raise InterruptedError()
-            future.add_response(step_latents(pipe, step_preview_mode, latents, generator, step, steps))
+            if (preview := step_latents(pipe, step_preview_mode, latents, generator, step, steps)) is not None:
+                future.add_response(preview)
         try:
             result = pipe(
                 prompt=prompt,
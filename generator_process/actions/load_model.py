@@ -1,10 +1,13 @@
 import gc
 import logging
 import os
-from ..models import Checkpoint, ModelConfig, Scheduler
+from ..models import Checkpoint, CPUOffload, ModelConfig, Scheduler
 
 logger = logging.getLogger(__name__)
 
+# number of previously selected models kept in memory, so switching back to them doesn't reload them from disk
+MODEL_CACHE_FALLBACKS = 1
+
 
 def revision_paths(model, config="model_index.json"):
     from huggingface_hub.constants import HF_HUB_CACHE
@@ -154,6 +157,14 @@ def _convert_pipe(cache, model, pipe, model_class, half_precision, scheduler, **
     return pipe
 
 
+def _remove_safety_checker(pipe):
+    # the safety checker is never run, so don't keep its CLIP model in memory or include it in cpu offloading
+    if getattr(pipe, "safety_checker", None) is not None:
+        pipe.safety_checker = None
+    if getattr(pipe, "feature_extractor", None) is not None:
+        pipe.feature_extractor = None
+
+
 @cache_check(exists_callback=_convert_pipe)
 def _load_pipeline(cache, model, model_class, half_precision, scheduler, **kwargs):
     import torch
@@ -162,6 +173,7 @@ def _load_pipeline(cache, model, model_class, half_precision, scheduler, **kwarg
 
     if isinstance(model, Checkpoint) or os.path.splitext(model)[1] in [".ckpt", ".safetensors"]:
         pipe = _load_checkpoint(model_class, model, dtype, **kwargs)
+        _remove_safety_checker(pipe)
         scheduler.create(pipe)
         return pipe
 
@@ -183,7 +195,8 @@ def _load_pipeline(cache, model, model_class, half_precision, scheduler, **kwarg
         if strat.pop("_warn_precision_fallback", False):
             logger.warning(f"Can't load fp32 weights for model {model}, attempting to load fp16 instead")
         try:
-            pipe = model_class.from_pretrained(strat.pop("model_path"), torch_dtype=dtype, safety_checker=None, requires_safety_checker=False, **strat, **kwargs)
+            pipe = model_class.from_pretrained(strat.pop("model_path"), torch_dtype=dtype, safety_checker=None, requires_safety_checker=False, feature_extractor=None, **strat, **kwargs)
+            _remove_safety_checker(pipe)
             pipe.scheduler = scheduler.create(pipe)
             return pipe
         except Exception as e:
@@ -195,37 +208,56 @@ def _load_pipeline(cache, model, model_class, half_precision, scheduler, **kwarg
 def load_model(self, model_class, model, optimizations, scheduler, controlnet=None, sdxl_refiner_model=None, **kwargs):
     import torch
     from diffusers import StableDiffusionXLPipeline, AutoPipelineForImage2Image
+    from .. import deep_cache
     from diffusers.models.controlnets.multicontrolnet import MultiControlNetModel
 
     device = self.choose_device(optimizations)
     half_precision = optimizations.can_use_half(device)
-    invalidation_properties = (device, half_precision, optimizations.cpu_offloading(device), controlnet is not None)
+    cpu_offload = optimizations.cpu_offloading(device)
+    prefetch = cpu_offload == CPUOffload.SUBMODULE and optimizations.can_use("cpu_offload_prefetch", device)
+    invalidation_properties = (device, half_precision, cpu_offload, prefetch, controlnet is not None)
 
     # determine models to be removed from cache
     if not hasattr(self, "_pipe") or self._pipe is None or self._pipe[0] != invalidation_properties:
         model_cache = {}
-        self._pipe = (invalidation_properties, model_cache)
+        # values of `model` from least to most recently selected, only these are kept as fallbacks
+        # so a refiner or ControlNet used alongside the selected model is never kept in its place
+        recent_models = []
+        self._pipe = (invalidation_properties, model_cache, recent_models)
         gc.collect()
         torch.cuda.empty_cache()
     else:
-        model_cache = self._pipe[1]
+        model_cache, recent_models = self._pipe[1], self._pipe[2]
         expected_models = {model}
         if sdxl_refiner_model is not None:
             expected_models.add(sdxl_refiner_model)
         if controlnet is not None:
             expected_models.update(name for name in controlnet)
-        clear_models = set(model_cache).difference(expected_models)
+        previous_models = [name for name in recent_models if name in model_cache and name not in expected_models]
+        fallback_models = previous_models[-MODEL_CACHE_FALLBACKS:] if MODEL_CACHE_FALLBACKS > 0 else []
+        clear_models = [name for name in model_cache if name not in expected_models and name not in fallback_models]
         for name in clear_models:
             model_cache.pop(name)
+        # offloaded models are already out of device memory
+        parked_models = [] if cpu_offload else [name for name in fallback_models if model_cache[name].device.type != "cpu"]
+        for name in parked_models:
+            # make room for the selected models, `Optimizations.apply()` moves it back to the device when it's selected again
+            model_cache[name].to("cpu")
+            deep_cache.clear(model_cache[name])
         for pipe in model_cache.values():
             if isinstance(getattr(pipe, "controlnet", None), MultiControlNetModel):
                 # make sure no longer needed ControlNetModels are cleared
                 # the MultiControlNetModel container will be remade
                 pipe.controlnet = None
-        if len(clear_models) > 0:
+        if len(clear_models) > 0 or len(parked_models) > 0:
             gc.collect()
             torch.cuda.empty_cache()
 
+    if model in recent_models:
+        recent_models.remove(model)
+    recent_models.append(model)
+    del recent_models[:-(MODEL_CACHE_FALLBACKS + 1)]
+
     # load or obtain models from cache
     if controlnet is not None:
         kwargs["controlnet"] = MultiControlNetModel([
@@ -1,4 +1,5 @@
 import functools
+import types
 from typing import Generator
 from contextlib import nullcontext
 
@@ -8,6 +9,7 @@ from ...api.models.seamless_axes import SeamlessAxes
 from ...api.models.step_preview_mode import StepPreviewMode
 from ..models import Checkpoint, Optimizations, Scheduler
 from ..models.image_generation_result import step_latents, step_images
+from ..models.upscale_tiler import configure_model_padding
 from ..future import Future
 
 def prompt_to_image(
@@ -83,7 +85,8 @@ def prompt_to_image(
         def callback(pipe, step, timestep, callback_kwargs):
             if future.check_cancelled():
                 raise InterruptedError()
-            future.add_response(step_latents(pipe, step_preview_mode, callback_kwargs["latents"], generator, step, steps))
+            if (preview := step_latents(pipe, step_preview_mode, callback_kwargs["latents"], generator, step, steps)) is not None:
+                future.add_response(preview)
             return callback_kwargs
         try:
             result = pipe(
@@ -92,7 +95,8 @@ def prompt_to_image(
                 width=width,
                 num_inference_steps=steps,
                 guidance_scale=cfg_scale,
-                negative_prompt=negative_prompt if use_negative_prompt else None,
+                # guidance_scale <= 1 disables classifier-free guidance and runs only the conditional batch, leaving nothing to use a negative prompt
+                negative_prompt=negative_prompt if use_negative_prompt and cfg_scale > 1 else None,
                 num_images_per_prompt=1,
                 eta=0.0,
                 generator=generator,
@@ -125,63 +129,22 @@ def prompt_to_image(
     
     future.set_done()
 
-def _conv_forward_asymmetric(self, input, weight, bias):
-    import torch.nn as nn
-    """
-    Patch for Conv2d._conv_forward that supports asymmetric padding
-    """
-    if input.device.type == "dml":
-        # DML pad() will wrongly fill the tensor in constant mode with the supplied value
-        # (default 0) when padding on both ends of a dimension, can't split to two calls.
-        working = nn.functional.pad(input, self._reversed_padding_repeated_twice, mode='circular')
-        pad_w0, pad_w1, pad_h0, pad_h1 = self._reversed_padding_repeated_twice
-        if self.asymmetric_padding_mode[0] == 'constant':
-            working[:, :, :, :pad_w0] = 0
-            if pad_w1 > 0:
-                working[:, :, :, -pad_w1:] = 0
-        if self.asymmetric_padding_mode[1] == 'constant':
-            working[:, :, :pad_h0] = 0
-            if pad_h1 > 0:
-                working[:, :, -pad_h1:] = 0
-    else:
-        working = nn.functional.pad(input, self.asymmetric_padding[0], mode=self.asymmetric_padding_mode[0])
-        working = nn.functional.pad(working, self.asymmetric_padding[1], mode=self.asymmetric_padding_mode[1])
-    return nn.functional.conv2d(working, weight, bias, self.stride, nn.modules.utils._pair(0), self.dilation, self.groups)
-
 def _lora_compatible_conv_forward(self, hidden_states, scale=1.0):
     return self._conv_forward(hidden_states, self.weight, self.bias)
 
 def _configure_model_padding(model, seamless_axes):
-    import torch.nn as nn
     from diffusers.models.lora import LoRACompatibleConv
     """
     Modifies the 2D convolution layers to use a circular padding mode based on the `seamless` and `seamless_axes` options.
     """
-    seamless_axes = SeamlessAxes(seamless_axes)
-    if seamless_axes == SeamlessAxes.AUTO:
-        seamless_axes = seamless_axes.OFF
-    if getattr(model, "seamless_axes", SeamlessAxes.OFF) == seamless_axes:
+    if not configure_model_padding(model, seamless_axes):
         return
-    model.seamless_axes = seamless_axes
     for m in model.modules():
-        if isinstance(m, (nn.Conv2d, nn.ConvTranspose2d, LoRACompatibleConv)):
-            if seamless_axes.x or seamless_axes.y:
-                if isinstance(m, LoRACompatibleConv):
-                    m.forward = _lora_compatible_conv_forward.__get__(m, LoRACompatibleConv)
-                m.asymmetric_padding_mode = (
-                    'circular' if seamless_axes.x else 'constant',
-                    'circular' if seamless_axes.y else 'constant'
-                )
-                m.asymmetric_padding = (
-                    (m._reversed_padding_repeated_twice[0], m._reversed_padding_repeated_twice[1], 0, 0),
-                    (0, 0, m._reversed_padding_repeated_twice[2], m._reversed_padding_repeated_twice[3])
-                )
-                m._conv_forward = _conv_forward_asymmetric.__get__(m, nn.Conv2d)
-            else:
-                if isinstance(m, LoRACompatibleConv):
-                    m.forward = LoRACompatibleConv.forward.__get__(m, LoRACompatibleConv)
-                m._conv_forward = nn.Conv2d._conv_forward.__get__(m, nn.Conv2d)
-                if hasattr(m, 'asymmetric_padding_mode'):
-                    del m.asymmetric_padding_mode
-                if hasattr(m, 'asymmetric_padding'):
-                    del m.asymmetric_padding
+        if isinstance(m, LoRACompatibleConv):
+            # LoRACompatibleConv.forward() doesn't go through `_conv_forward()`, so it is bypassed while padding is patched
+            if hasattr(m, "unpatched_conv_forward") and not hasattr(m, "unpatched_forward"):
+                m.unpatched_forward = m.forward
+                m.forward = types.MethodType(_lora_compatible_conv_forward, m)
+            elif not hasattr(m, "unpatched_conv_forward") and hasattr(m, "unpatched_forward"):
+                m.forward = m.unpatched_forward
+                del m.unpatched_forward
@@ -1,5 +1,7 @@
 from multiprocessing import Queue, Lock, current_process, get_context
+from multiprocessing.shared_memory import SharedMemory
 import multiprocessing.synchronize
+import dataclasses
 import enum
 import queue
 import traceback
@@ -9,7 +11,7 @@ import site
 import sys
 import os
 from ..absolute_path import absolute_path
-from .future import Future
+from .future import Future, DroppableResponse
 
 def _patch_zip_direct_transformers_import():
     # direct_transformers_import() implementation doesn't work when transformers is in a zip archive
@@ -81,14 +83,30 @@ class Message:
         self.args = args
         self.kwargs = kwargs
     
-    CANCEL = "__cancel__"
     END = "__end__"
 
-def _start_backend(cls, message_queue, response_queue):
+class SharedArray:
+    """
+    Stands in for a numpy array that was copied into a shared memory segment instead of being pickled.
+    """
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+# Smaller arrays are cheaper to pickle than to copy through shared memory.
+SHARED_ARRAY_MIN_BYTES = 1 << 16
+# Number of segments that can be in flight to the frontend before responses fall back to pickling.
+SHARED_MEMORY_SLOTS = 4
+
+def _start_backend(cls, message_queue, response_queue, cancel_event, free_queue):
     cls(
         ActorContext.BACKEND,
         message_queue=message_queue,
-        response_queue=response_queue
+        response_queue=response_queue,
+        cancel_event=cancel_event,
+        free_queue=free_queue
     ).start()
 
 class TracedError(BaseException):
@@ -110,6 +128,8 @@ class Actor:
 
     _message_queue: Queue
     _response_queue: Queue
+    _cancel_event: multiprocessing.synchronize.Event
+    _free_queue: Queue
     _lock: multiprocessing.synchronize.Lock
 
     _shared_instance = None
@@ -123,10 +143,14 @@ class Actor:
         "shared"
     }
 
-    def __init__(self, context: ActorContext, message_queue: Queue = None, response_queue: Queue = None):
+    def __init__(self, context: ActorContext, message_queue: Queue = None, response_queue: Queue = None, cancel_event: multiprocessing.synchronize.Event = None, free_queue: Queue = None):
         self.context = context
         self._message_queue = message_queue if message_queue is not None else get_context('spawn').Queue(maxsize=1)
         self._response_queue = response_queue if response_queue is not None else get_context('spawn').Queue(maxsize=1)
+        # set by the frontend as soon as the current request is cancelled, checked by the backend between responses
+        self._cancel_event = cancel_event if cancel_event is not None else get_context('spawn').Event()
+        # names of `SharedArray` segments the frontend has finished reading
+        self._free_queue = free_queue if free_queue is not None else get_context('spawn').Queue()
         self._setup()
         self.__class__._shared_instance = self
     
@@ -137,10 +161,13 @@ class Actor:
         match self.context:
             case ActorContext.FRONTEND:
                 self._lock = Lock()
+                self._cancel_lock = threading.RLock()
+                self._shared_memory_names = set()
                 for name in filter(lambda name: callable(getattr(self, name)) and not name.startswith("_") and name not in self._protected_methods, dir(self)):
                     setattr(self, name, self._send(name))
             case ActorContext.BACKEND:
-                pass
+                self._shared_memory = {}
+                self._free_shared_memory = []
 
     @classmethod
     def shared(cls: Type[T]) -> T:
@@ -152,7 +179,7 @@ class Actor:
         """
         match self.context:
             case ActorContext.FRONTEND:
-                self.process = get_context('spawn').Process(target=_start_backend, args=(self.__class__, self._message_queue, self._response_queue), name="__actor__", daemon=True)
+                self.process = get_context('spawn').Process(target=_start_backend, args=(self.__class__, self._message_queue, self._response_queue, self._cancel_event, self._free_queue), name="__actor__", daemon=True)
                 main_module = sys.modules["__main__"]
                 main_file = getattr(main_module, "__file__", None)
                 if main_file is not None:
@@ -178,8 +205,17 @@ class Actor:
         match self.context:
             case ActorContext.FRONTEND:
                 self.process.terminate()
+                for name in self._shared_memory_names:
+                    # the backend can't clean up its segments after being terminated
+                    try:
+                        shm = SharedMemory(name=name)
+                        shm.close()
+                        shm.unlink()
+                    except FileNotFoundError:
+                        pass
                 self._message_queue.close()
                 self._response_queue.close()
+                self._free_queue.close()
             case ActorContext.BACKEND:
                 pass
     
@@ -211,27 +247,17 @@ class Actor:
             response = getattr(self, message.method_name)(*message.args, **message.kwargs)
             if isinstance(response, Generator):
                 for res in iter(response):
-                    extra_message = None
-                    try:
-                        extra_message = self._message_queue.get(block=False)
-                    except:
-                        pass
-                    if extra_message == Message.CANCEL:
+                    if self._cancel_event.is_set():
                         break
                     if isinstance(res, Future):
-                        def check_cancelled():
-                            try:
-                                return self._message_queue.get(block=False) == Message.CANCEL
-                            except:
-                                return False
-                        res.check_cancelled = check_cancelled
-                        res.add_response_callback(lambda _, res: self._response_queue.put(res))
+                        res.check_cancelled = self._cancel_event.is_set
+                        res.add_response_callback(lambda _, res: self._put_response(res))
                         res.add_exception_callback(lambda _, e: self._response_queue.put(RuntimeError(repr(e))))
                         res.add_done_callback(lambda _: None)
                     else:
-                        self._response_queue.put(res)
+                        self._put_response(res)
             else:
-                self._response_queue.put(response)
+                self._put_response(response)
         except Exception as e:
             trace = traceback.format_exc()
             try:
@@ -245,6 +271,90 @@ class Actor:
         self._log_vram_stats()
         self._response_queue.put(Message.END)
 
+    def _put_response(self, response):
+        """
+        Send a response to the frontend, moving any large numpy arrays through shared memory.
+
+        A `DroppableResponse` is skipped if the frontend hasn't received the previous response yet.
+        """
+        if isinstance(response, DroppableResponse) and self._response_queue.full():
+            return
+        self._response_queue.put(self._share_arrays(response))
+
+    def _share_arrays(self, value):
+        np = sys.modules.get("numpy")
+        if np is None:
+            return value
+        if isinstance(value, np.ndarray):
+            if value.nbytes < SHARED_ARRAY_MIN_BYTES or value.dtype.hasobject:
+                return value
+            shm = self._take_shared_memory(value.nbytes)
+            if shm is None:
+                return value
+            shared = np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)
+            shared[...] = value
+            del shared
+            return SharedArray(shm.name, value.shape, value.dtype.str)
+        if type(value) in (list, tuple, DroppableResponse):
+            return type(value)(self._share_arrays(v) for v in value)
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return dataclasses.replace(value, **{
+                field.name: self._share_arrays(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+                if field.init and isinstance(getattr(value, field.name), np.ndarray)
+            })
+        return value
+
+    def _take_shared_memory(self, size):
+        """
+        Get a segment of at least `size` bytes that the frontend isn't reading, or `None` if all are in use.
+        """
+        while True:
+            try:
+                self._free_shared_memory.append(self._free_queue.get(block=False))
+            except queue.Empty:
+                break
+        for name in self._free_shared_memory:
+            if self._shared_memory[name].size >= size:
+                self._free_shared_memory.remove(name)
+                return self._shared_memory[name]
+        if len(self._shared_memory) >= SHARED_MEMORY_SLOTS:
+            if len(self._free_shared_memory) == 0:
+                return None
+            # replace a free segment that is too small
+            shm = self._shared_memory.pop(self._free_shared_memory.pop())
+            shm.close()
+            shm.unlink()
+        shm = SharedMemory(create=True, size=size)
+        self._shared_memory[shm.name] = shm
+        return shm
+
+    def _receive_arrays(self, value):
+        """
+        Copy any `SharedArray` in a response out of shared memory, and release the segment back to the backend.
+        """
+        if isinstance(value, SharedArray):
+            import numpy as np
+            self._shared_memory_names.add(value.name)
+            shm = SharedMemory(name=value.name)
+            try:
+                shared = np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)
+                array = shared.copy()
+                del shared
+            finally:
+                shm.close()
+            self._free_queue.put(value.name)
+            return array
+        if type(value) in (list, tuple, DroppableResponse):
+            return type(value)(self._receive_arrays(v) for v in value)
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return dataclasses.replace(value, **{
+                field.name: self._receive_arrays(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+                if field.init and isinstance(getattr(value, field.name), SharedArray)
+            })
+        return value
+
     def _log_vram_stats(self):
         """Print peak VRAM after each request so slowdowns from driver sysmem-fallback are visible."""
         try:
@@ -262,18 +372,30 @@ class Actor:
         except Exception:
             pass
 
+    def _cancel_request(self, future: Future):
+        with self._cancel_lock:
+            # a late cancel must not leak into the next request once this one is done
+            if not future.done:
+                self._cancel_event.set()
+
     def _send(self, name):
         def _send(*args, _block=False, **kwargs):
+            """
+            Dispatch the call to the backend and return a `Future` for its responses.
+
+            With `_block=True` the call is handled on the calling thread and the returned `Future` is already done,
+            which avoids starting a thread when the caller waits for the result anyway.
+            """
             if main_thread_rendering:
                 _block = True
             future = Future()
             def _send_thread(future: Future):
                 self._lock.acquire()
+                self._cancel_event.clear()
+                future.add_cancel_callback(self._cancel_request)
                 self._message_queue.put(Message(name, args, kwargs))
 
                 while not future.done:
-                    if future.cancelled:
-                        self._message_queue.put(Message.CANCEL)
                     try:
                         response = self._response_queue.get(timeout=1)
                     except queue.Empty:
@@ -285,18 +407,20 @@ class Actor:
                                 "Check the system console for details (Window > Toggle System Console). "
                                 "This often means the installed dependencies do not match Blender's Python version."
                             ))
-                            future.set_done()
+                            with self._cancel_lock:
+                                future.set_done()
                             break
                         continue
-                    if response == Message.END:
-                        future.set_done()
+                    if isinstance(response, str) and response == Message.END:
+                        with self._cancel_lock:
+                            future.set_done()
                     elif isinstance(response, TracedError):
                         response.base.__cause__ = Exception(response.trace)
                         future.set_exception(response.base)
                     elif isinstance(response, Exception):
                         future.set_exception(response)
                     else:
-                        future.add_response(response)
+                        future.add_response(self._receive_arrays(response))
                 
                 self._lock.release()
             if _block:
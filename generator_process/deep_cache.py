@@ -0,0 +1,124 @@
+"""
+DeepCache style reuse of the UNet's deep features between denoising steps.
+https://arxiv.org/abs/2312.00858
+
+Every `interval` steps the whole UNet runs and the outputs of its deeper blocks are cached.
+The steps in between reuse those outputs, so only the outermost down and up blocks are evaluated.
+"""
+import weakref
+
+import torch
+
+# fewer steps than this leaves too few full evaluations for the cached features to stay accurate
+MIN_STEPS = 6
+
+
+class _DeepCache:
+    def __init__(self):
+        self.pipe = None
+        self.interval = None
+        self.timesteps = None
+        self.steps = 0
+        self.calls = 0
+        self.reuse = False
+        self.outputs = {}
+
+    def pre_forward(self, unet, args, kwargs):
+        pipe = self.pipe() if self.pipe is not None else None
+        scheduler = getattr(pipe, "scheduler", None)
+        timesteps = getattr(scheduler, "timesteps", None)
+        if timesteps is not self.timesteps:
+            # `set_timesteps()` makes a new tensor for every generation
+            self.timesteps = timesteps
+            self.steps = 0 if timesteps is None else len(timesteps) - _first_step(scheduler, timesteps, args, kwargs)
+            self.calls = 0
+            self.outputs.clear()
+        self.reuse = (
+            self.interval is not None
+            and self.steps >= MIN_STEPS
+            and self.calls % self.interval != 0
+        )
+        self.calls += 1
+
+    def post_forward(self, unet, args, output):
+        if self.calls >= self.steps:
+            # last step of the generation, don't hold onto the features in device memory
+            self.outputs.clear()
+
+    def wrap(self, module, key):
+        wrapper = module.__dict__.get("_deep_cache_forward", None)
+        if wrapper is not None and module.__dict__.get("forward", None) is wrapper:
+            return
+        forward = module.forward
+
+        def _deep_cache_forward(*args, **kwargs):
+            if self.reuse and key in self.outputs:
+                return self.outputs[key]
+            output = forward(*args, **kwargs)
+            if self.interval is not None:
+                self.outputs[key] = output
+            return output
+
+        module.forward = _deep_cache_forward
+        module._deep_cache_forward = _deep_cache_forward
+
+
+def _first_step(scheduler, timesteps, args, kwargs):
+    """
+    Index of the first timestep that is run, which isn't 0 when img2img style pipelines start partway with `strength`.
+    """
+    begin_index = getattr(scheduler, "_begin_index", None)
+    if begin_index is not None:
+        return begin_index
+    # pipelines that slice the timesteps themselves leave the full schedule on the scheduler
+    timestep = kwargs.get("timestep", args[1] if len(args) > 1 else None)
+    if timestep is None:
+        return 0
+    timestep = torch.as_tensor(timestep, device=timesteps.device).flatten()[0]
+    matches = (timesteps == timestep).nonzero()
+    return int(matches[0]) if len(matches) > 0 else 0
+
+
+def enable(pipe, interval):
+    unet = getattr(pipe, "unet", None)
+    if not isinstance(unet, torch.nn.Module):
+        return
+    state = getattr(unet, "_deep_cache", None)
+    if state is None:
+        state = _DeepCache()
+        unet._deep_cache = state
+        unet.register_forward_pre_hook(state.pre_forward, with_kwargs=True)
+        unet.register_forward_hook(state.post_forward)
+    # the pipeline is referenced for its current scheduler, which is replaced when the scheduler option changes
+    state.pipe = weakref.ref(pipe)
+    state.interval = max(1, interval)
+
+    # the outermost down and up blocks always run, everything between them can be reused
+    deep_blocks = [
+        *(("down", i, block) for i, block in enumerate(unet.down_blocks) if i > 0),
+        ("mid", 0, unet.mid_block),
+        *(("up", i, block) for i, block in enumerate(unet.up_blocks) if i < len(unet.up_blocks) - 1),
+    ]
+    for kind, i, block in deep_blocks:
+        if block is not None:
+            # wrapped after accelerate's offload hooks so reused blocks aren't moved onto the device
+            state.wrap(block, (kind, i))
+
+
+def disable(pipe):
+    unet = getattr(pipe, "unet", None)
+    state = getattr(unet, "_deep_cache", None)
+    if state is None:
+        return
+    state.interval = None
+    state.reuse = False
+    state.outputs.clear()
+
+
+def clear(pipe):
+    """
+    Free the cached features, for when the pipeline is moved off the device.
+    """
+    state = getattr(getattr(pipe, "unet", None), "_deep_cache", None)
+    if state is not None:
+        state.outputs.clear()
@@ -1,6 +1,14 @@
 import functools
 import threading
-from typing import Callable, Any, MutableSet
+from typing import Callable, Any
+
+class DroppableResponse(list):
+    """
+    A response that is superseded by the next one, like a step preview.
+
+    The actor drops it instead of waiting when the frontend hasn't received the previous response yet.
+    """
+
 
 class Future:
     """
@@ -8,10 +16,11 @@ class Future:
 
     Add callbacks to be notified when values become available, or use `.result()` and `.exception()` to wait for the value.
     """
-    _response_callbacks: MutableSet[Callable[['Future', Any], None]] = set()
-    _exception_callbacks: MutableSet[Callable[['Future', BaseException], None]] = set()
-    _done_callbacks: MutableSet[Callable[['Future'], None]] = set()
-    _responses: list = []
+    _response_callbacks: list[Callable[['Future', Any], None]]
+    _exception_callbacks: list[Callable[['Future', BaseException], None]]
+    _done_callbacks: list[Callable[['Future'], None]]
+    _cancel_callbacks: list[Callable[['Future'], None]]
+    _responses: list
     _exception: BaseException | None = None
     _done_event: threading.Event
     done: bool = False
@@ -22,9 +31,10 @@ class Future:
     call_done_on_exception: bool = True
 
     def __init__(self):
-        self._response_callbacks = set()
-        self._exception_callbacks = set()
-        self._done_callbacks = set()
+        self._response_callbacks = []
+        self._exception_callbacks = []
+        self._done_callbacks = []
+        self._cancel_callbacks = []
         self._responses = []
         self._exception = None
         self._done_event = threading.Event()
@@ -62,7 +72,14 @@ class Future:
             return self._exception
     
     def cancel(self):
+        """
+        Request that the work be stopped early and notify all cancel callbacks.
+        """
+        if self.cancelled:
+            return
         self.cancelled = True
+        for cancel_callback in self._cancel_callbacks:
+            cancel_callback(self)
 
     def _run_on_main_thread(self, func):
         if threading.current_thread() == threading.main_thread():
@@ -112,14 +129,14 @@ class Future:
         Add a callback to run whenever a response is received.
         Will be called multiple times by generator functions.
         """
-        self._response_callbacks.add(callback)
+        self._response_callbacks.append(callback)
     
     def add_exception_callback(self, callback: Callable[['Future', BaseException], None]):
         """
         Add a callback to run when the future errors.
         Will only be called once at the first exception.
         """
-        self._exception_callbacks.add(callback)
+        self._exception_callbacks.append(callback)
         if self._exception is not None:
             self._run_on_main_thread(functools.partial(callback, self, self._exception))
 
@@ -128,6 +145,15 @@ class Future:
         Add a callback to run when the future is marked as done.
         Will only be called once.
         """
-        self._done_callbacks.add(callback)
+        self._done_callbacks.append(callback)
         if self.done:
             self._run_on_main_thread(functools.partial(callback, self))
+
+    def add_cancel_callback(self, callback: Callable[['Future'], None]):
+        """
+        Add a callback to run when the future is cancelled, on the thread that called `cancel()`.
+        Will only be called once.
+        """
+        self._cancel_callbacks.append(callback)
+        if self.cancelled:
+            callback(self)
@@ -1,29 +1,27 @@
+import functools
+from dataclasses import dataclass
 from ...api.models.step_preview_mode import StepPreviewMode
 from ...api.models.generation_result import GenerationResult
+from ..future import DroppableResponse
 
 def step_latents(pipe, mode, latents, generator, iteration, steps):
+    """
+    Step preview results for `latents`, or `None` if this step's preview was dropped and there is nothing to send.
+    """
+    results = _step_latents(pipe, mode, latents, generator, iteration, steps)
+    if results is None:
+        return None
+    # previews are superseded by the next step, so they can be dropped rather than stall generation
+    return DroppableResponse(results)
+
+def _step_latents(pipe, mode, latents, generator, iteration, steps):
     seeds = [gen.initial_seed() for gen in generator] if isinstance(generator, list) else [generator.initial_seed()]
     scale = 2 ** (len(pipe.vae.config.block_out_channels) - 1)
     match mode:
         case StepPreviewMode.FAST:
-            return [
-                GenerationResult(
-                    progress=iteration,
-                    total=steps,
-                    seed=seeds[-1],
-                    image=approximate_decoded_latents(latents[-1:], scale)
-                )
-            ]
+            return _fast_step_results(pipe, iteration, steps, [seeds[-1]], [latents[-1:]], scale)
         case StepPreviewMode.FAST_BATCH:
-            return [
-                GenerationResult(
-                    progress=iteration,
-                    total=steps,
-                    seed=seed,
-                    image=approximate_decoded_latents(latent, scale)
-                )
-                for latent, seed in zip(latents[:, None], seeds)
-            ]
+            return _fast_step_results(pipe, iteration, steps, seeds, latents[:, None], scale)
         case StepPreviewMode.ACCURATE:
             return [
                 GenerationResult(
@@ -51,6 +49,100 @@ def step_latents(pipe, mode, latents, generator, iteration, steps):
         )
     ]
 
+@dataclass
+class _PendingPreview:
+    """
+    Step preview frames that are being approximated and copied to the host on the preview stream.
+    """
+    iteration: int
+    seeds: list
+    images: list
+    copied: object # torch.cuda.Event recorded after the copies
+    already_sent: bool = False
+
+def _fast_step_results(pipe, iteration, steps, seeds, latents, scale):
+    """
+    Approximate each of `latents` into step preview results, or return `None` to skip this step.
+
+    On CUDA the frames are approximated and copied to pinned host memory on a side stream, so
+    the UNet never waits for a preview. Each step starts its own frames, and returns the ones
+    started by the previous step, which have had a whole step to finish:
+
+    * The first step has nothing earlier to return, so it waits for its own frames and sends them.
+      The second step is then skipped, since what it would return has already been sent.
+    * A step is skipped when the previous frames aren't ready yet, and starts no new frames of its own.
+    * The last step starts no frames, since the final image follows right after it. It sends the
+      previous step's frames if they weren't sent yet, and leaves nothing pending on the pipeline.
+    """
+    import torch
+    device = latents[0].device
+    if device.type != "cuda":
+        return [
+            GenerationResult(
+                progress=iteration,
+                total=steps,
+                seed=seed,
+                image=_approximate_rgba(latent, scale).cpu().numpy()
+            )
+            for latent, seed in zip(latents, seeds)
+        ]
+
+    previous: _PendingPreview | None = getattr(pipe, "_pending_step_preview", None)
+    if previous is not None and previous.iteration >= iteration:
+        # left over from an earlier generation that was cancelled
+        previous = None
+    # pipelines started partway by `strength` run fewer steps than requested
+    last_step = iteration >= getattr(pipe, "_num_timesteps", steps) - 1
+
+    if last_step:
+        pipe._pending_step_preview = None
+        frames = previous
+    elif previous is not None and not previous.copied.query():
+        # the frontend expects fast previews to have an image, so skip the step rather than send an empty one
+        return None
+    else:
+        # a snapshot is cheap and keeps the side stream from reading latents the denoise loop has moved on from
+        latents = [latent.clone() for latent in latents]
+        stream = _preview_stream(device)
+        stream.wait_stream(torch.cuda.current_stream(device))
+        host_images = []
+        with torch.cuda.stream(stream):
+            for latent in latents:
+                latent.record_stream(stream)
+                image = _approximate_rgba(latent, scale)
+                # a new pinned tensor per frame is served from PyTorch's caching host allocator, which only
+                # reuses a block once it is freed and its copy has finished. The returned numpy arrays keep
+                # their tensor alive, so a frame is never overwritten while a response still references it,
+                # which a fixed set of reused buffers couldn't guarantee with asynchronous queue pickling.
+                host_image = torch.empty(image.shape, dtype=image.dtype, pin_memory=True)
+                host_image.copy_(image, non_blocking=True)
+                host_images.append(host_image)
+        copied = torch.cuda.Event()
+        copied.record(stream)
+        pipe._pending_step_preview = _PendingPreview(iteration, seeds, host_images, copied)
+        # the first step has no earlier frames, so it returns its own
+        frames = previous if previous is not None else pipe._pending_step_preview
+
+    if frames is None or frames.already_sent:
+        return None
+    frames.already_sent = True
+    frames.copied.synchronize()
+    return [
+        GenerationResult(
+            # reports the current progress even though the frames are a step behind, so it never goes backwards after a skipped step
+            progress=iteration,
+            total=steps,
+            seed=seed,
+            image=image.numpy()
+        )
+        for image, seed in zip(frames.images, frames.seeds)
+    ]
+
+@functools.cache
+def _preview_stream(device):
+    import torch
+    return torch.cuda.Stream(device)
+
 def step_images(images, generator, iteration, steps):
     if not isinstance(images, list) and images.ndim == 3:
         images = images[None]
@@ -68,9 +160,10 @@ def step_images(images, generator, iteration, steps):
 def decode_latents(pipe, latents):
     return pipe.image_processor.postprocess(pipe.vae.decode(latents / pipe.vae.config.scaling_factor).sample, output_type="np")
 
-def approximate_decoded_latents(latents, scale=None):
+@functools.cache
+def _latent_rgb_factors(device):
     """
-    Approximate the decoded latents without using the VAE.
+    The latent to RGB projection for `device`, pre-scaled by 0.5 to fold the [-1, 1] to [0, 1] remap into the matmul.
     """
     import torch
     # origingally adapted from code by @erucipe and @keturn here:
@@ -83,12 +176,21 @@ def approximate_decoded_latents(latents, scale=None):
         [ 0.1247,  0.4027,  0.1494], # L2
         [-0.3192,  0.2513,  0.2103], # L3
         [-0.1307, -0.1874, -0.7445]  # L4
-    ], dtype=latents.dtype, device=latents.device)
+    ], dtype=torch.float32, device=device)
+    return v1_5_latent_rgb_factors.mul_(0.5)
 
-    latent_image = latents[0].permute(1, 2, 0) @ v1_5_latent_rgb_factors
+def _approximate_rgba(latents, scale=None):
+    import torch
+    _, height, width = latents[0].shape
+    # (latents @ factors + 1) / 2, with the factors pre-scaled by 0.5
+    # a python scalar bias avoids creating a device tensor, which would block on a host to device copy
+    latent_image = torch.mm(
+        latents[0].permute(1, 2, 0).reshape(-1, 4).float(),
+        _latent_rgb_factors(latents.device)
+    ).add_(0.5).view(height, width, 3).clamp_(0, 1)
     if scale is not None:
         latent_image = torch.nn.functional.interpolate(
             latent_image.permute(2, 0, 1).unsqueeze(0), scale_factor=scale, mode="nearest"
         ).squeeze(0).permute(1, 2, 0)
-    latent_image = ((latent_image + 1) / 2).clamp(0, 1).cpu()
-    return latent_image.numpy()
+    # expand to RGBA on the device so the preview is ready for `np_to_bpy()` after a single transfer
+    return torch.cat([latent_image, torch.ones_like(latent_image[..., :1])], dim=-1)
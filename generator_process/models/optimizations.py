@@ -22,11 +22,13 @@ class Optimizations:
     attention_slicing: bool = True
     attention_slice_size: Union[str, int] = "auto"
     cudnn_benchmark: Annotated[bool, "cuda"] = False
-    tf32: Annotated[bool, "cuda"] = False
+    tf32: Annotated[bool, "cuda"] = True
+    cudnn_tf32: Annotated[bool, "cuda"] = True
     amp: Annotated[bool, "cuda"] = False
     half_precision: Annotated[bool, {"cuda", "dml"}] = True
     cpu_offload: Annotated[str, {"cuda", "dml"}] = CPUOffload.OFF
-    channels_last_memory_format: bool = False
+    cpu_offload_prefetch: Annotated[bool, "cuda"] = True
+    channels_last_memory_format: str = "auto"
     sdp_attention: bool = True
     batch_size: int = 1
     vae_slicing: bool = True
@@ -34,6 +36,8 @@ class Optimizations:
     vae_tile_size: int = 512
     vae_tile_blend: int = 64
     cfg_end: float = 1.0
+    deep_cache: bool = False
+    deep_cache_interval: int = 2
 
     cpu_only: bool = False
 
@@ -49,16 +53,16 @@ class Optimizations:
 
     @classmethod
     def device_supports(cls, property, device) -> bool:
-        annotation = cls.__annotations__.get(property, None)
-        if isinstance(annotation, _AnnotatedAlias):
-            opt_dev = annotation.__metadata__[0]
-            if isinstance(opt_dev, str):
-                return opt_dev == device
-            return device in opt_dev
-        return annotation is not None
+        if property not in cls._device_requirements:
+            return False
+        devices = cls._device_requirements[property]
+        return devices is None or device in devices
 
     def can_use(self, property, device) -> bool:
-        return self.device_supports(property, device) and getattr(self, property)
+        if not getattr(self, property):
+            return False
+        devices = self._device_requirements.get(property)
+        return devices is None or device in devices
 
     def can_use_half(self, device):
         if self.half_precision and device == "cuda":
@@ -69,6 +73,13 @@ class Optimizations:
 
     def cpu_offloading(self, device):
         return self.cpu_offload if self.device_supports("cpu_offload", device) else CPUOffload.OFF
+
+    def channels_last(self, device):
+        if self.channels_last_memory_format == "auto":
+            # fp16 convolutions on Turing or newer have native NHWC kernels, older GPUs are slower with it
+            import torch
+            return device == "cuda" and self.can_use_half(device) and torch.cuda.get_device_capability() >= (7, 5)
+        return self.can_use("channels_last_memory_format", device) and self.channels_last_memory_format != "off"
     
     def apply(self, pipeline, device):
         """
@@ -82,7 +93,10 @@ class Optimizations:
             pipeline = pipeline.to(device)
 
         torch.backends.cudnn.benchmark = self.can_use("cudnn_benchmark", device)
-        torch.backends.cuda.matmul.allow_tf32 = self.can_use("tf32", device)
+        matmul_tf32 = self.can_use("tf32", device)
+        torch.backends.cuda.matmul.allow_tf32 = matmul_tf32
+        torch.backends.cudnn.allow_tf32 = self.can_use("cudnn_tf32", device)
+        torch.set_float32_matmul_precision("high" if matmul_tf32 else "highest")
 
         try:
             if self.can_use("sdp_attention", device):
@@ -129,7 +143,13 @@ class Optimizations:
                     models.append(pipeline.text_encoder)
                 if hasattr(pipeline, "text_encoder_2"):
                     models.append(pipeline.text_encoder_2)
-                models.extend([pipeline.unet, pipeline.vae])
+                if self.can_use("cpu_offload_prefetch", device):
+                    # the unet runs every step, so its transfers are overlapped with computation instead
+                    from .. import prefetch_offload
+                    prefetch_offload.enable(pipeline.unet, device)
+                else:
+                    models.append(pipeline.unet)
+                models.append(pipeline.vae)
                 if hasattr(pipeline, "controlnet"):
                     models.append(pipeline.controlnet)
                 for cpu_offloaded_model in models:
@@ -140,10 +160,12 @@ class Optimizations:
         except: pass
         
         try:
-            if self.can_use("channels_last_memory_format", device):
-                pipeline.unet.to(memory_format=torch.channels_last)
+            if self.channels_last(device):
+                memory_format = torch.channels_last
             else:
-                pipeline.unet.to(memory_format=torch.contiguous_format)
+                memory_format = torch.contiguous_format
+            pipeline.unet.to(memory_format=memory_format)
+            pipeline.vae.to(memory_format=memory_format)
         except: pass
 
         try:
@@ -164,10 +186,27 @@ class Optimizations:
                 pipeline.vae.decode = pipeline.vae.decode.keywords["pre_patch"]
         except: pass
         
+        try:
+            from .. import deep_cache
+            if self.can_use("deep_cache", device):
+                deep_cache.enable(pipeline, self.deep_cache_interval)
+            else:
+                deep_cache.disable(pipeline)
+        except: pass
+
         from .. import directml_patches
         if device == "dml":
             directml_patches.enable(pipeline)
         else:
             directml_patches.disable(pipeline)
 
-        return pipeline
\ No newline at end of file
+        return pipeline
+
+# Maps each optimization to the devices it supports, or None if it isn't device specific.
+# Resolved once here so `can_use()` doesn't need to inspect the annotations on every call.
+Optimizations._device_requirements = {
+    name: (
+        frozenset((annotation.__metadata__[0],)) if isinstance(annotation.__metadata__[0], str) else frozenset(annotation.__metadata__[0])
+    ) if isinstance(annotation, _AnnotatedAlias) else None
+    for name, annotation in Optimizations.__annotations__.items()
+}
@@ -5,7 +5,7 @@ class Scheduler(enum.Enum):
     DDPM = "DDPM"
     DEIS_MULTISTEP = "DEIS Multistep"
     DPM_SOLVER_MULTISTEP = "DPM Solver Multistep"
-    DPM_SOLVER_MULTISTEP_KARRAS = "DPM Solver Multistep Karras"
+    DPM_SOLVER_MULTISTEP_KARRAS = "DPM Solver Multistep Karras" # DPM++ 2M Karras, comparable quality to PNDM/DDIM at around 20 steps
     DPM_SOLVER_SINGLESTEP = "DPM Solver Singlestep"
     DPM_SOLVER_SINGLESTEP_KARRAS = "DPM Solver Singlestep Karras"
     EULER_DISCRETE = "Euler Discrete"
@@ -1,4 +1,5 @@
 import math
+import types
 from typing import Optional
 
 import numpy as np
@@ -211,31 +212,33 @@ def configure_model_padding(model, seamless_axes):
     import torch.nn as nn
     """
     Modifies the 2D convolution layers to use a circular padding mode based on the `seamless_axes` option.
+
+    Returns `False` if the model was already configured for `seamless_axes`.
     """
     seamless_axes = SeamlessAxes(seamless_axes)
     if seamless_axes == SeamlessAxes.AUTO:
         seamless_axes = seamless_axes.OFF
     if getattr(model, "seamless_axes", SeamlessAxes.OFF) == seamless_axes:
-        return
+        return False
     model.seamless_axes = seamless_axes
     for m in model.modules():
         if isinstance(m, (nn.Conv2d, nn.ConvTranspose2d)):
             if seamless_axes.x or seamless_axes.y:
-                m.asymmetric_padding_mode = (
-                    'circular' if seamless_axes.x else 'constant',
-                    'circular' if seamless_axes.y else 'constant'
-                )
-                m.asymmetric_padding = (
-                    (m._reversed_padding_repeated_twice[0], m._reversed_padding_repeated_twice[1], 0, 0),
-                    (0, 0, m._reversed_padding_repeated_twice[2], m._reversed_padding_repeated_twice[3])
-                )
-                m._conv_forward = _conv_forward_asymmetric.__get__(m, nn.Conv2d)
-            else:
-                m._conv_forward = nn.Conv2d._conv_forward.__get__(m, nn.Conv2d)
-                if hasattr(m, 'asymmetric_padding_mode'):
-                    del m.asymmetric_padding_mode
-                if hasattr(m, 'asymmetric_padding'):
-                    del m.asymmetric_padding
+                if not hasattr(m, "unpatched_conv_forward"):
+                    # patch once, changing between seamless axes only needs the padding attributes updated
+                    m.unpatched_conv_forward = getattr(m, "_conv_forward", None)
+                    m._conv_forward = types.MethodType(_conv_forward_asymmetric, m)
+                _set_asymmetric_padding(m, seamless_axes)
+            elif hasattr(m, "unpatched_conv_forward"):
+                if m.unpatched_conv_forward is None:
+                    del m._conv_forward
+                else:
+                    m._conv_forward = m.unpatched_conv_forward
+                del m.unpatched_conv_forward
+                del m.asymmetric_padding_mode
+                del m.asymmetric_padding
+                del m.asymmetric_conv_padding
+    return True
 
 def _conv_forward_asymmetric(self, input, weight, bias):
     import torch.nn as nn
@@ -255,7 +258,38 @@ def _conv_forward_asymmetric(self, input, weight, bias):
             working[:, :, :pad_h0] = 0
             if pad_h1 > 0:
                 working[:, :, -pad_h1:] = 0
+        conv_padding = nn.modules.utils._pair(0)
+    else:
+        working = input
+        for padding, mode in self.asymmetric_padding:
+            working = nn.functional.pad(working, padding, mode=mode)
+        conv_padding = self.asymmetric_conv_padding
+    return nn.functional.conv2d(working, weight, bias, self.stride, conv_padding, self.dilation, self.groups)
+
+def _set_asymmetric_padding(m, seamless_axes):
+    """
+    Precompute the `pad()` calls used by `_conv_forward_asymmetric` for the given axes.
+
+    Padding is done in a single call when both axes are circular. When only one is, the other axis
+    is zero padded by `conv2d()` itself as long as its padding is symmetric.
+    """
+    pad_w0, pad_w1, pad_h0, pad_h1 = m._reversed_padding_repeated_twice
+    m.asymmetric_padding_mode = (
+        'circular' if seamless_axes.x else 'constant',
+        'circular' if seamless_axes.y else 'constant'
+    )
+    if seamless_axes.x and seamless_axes.y:
+        m.asymmetric_padding = (((pad_w0, pad_w1, pad_h0, pad_h1), 'circular'),)
+        m.asymmetric_conv_padding = (0, 0)
+    elif seamless_axes.x and pad_h0 == pad_h1:
+        m.asymmetric_padding = (((pad_w0, pad_w1, 0, 0), 'circular'),)
+        m.asymmetric_conv_padding = (pad_h0, 0)
+    elif seamless_axes.y and pad_w0 == pad_w1:
+        m.asymmetric_padding = (((0, 0, pad_h0, pad_h1), 'circular'),)
+        m.asymmetric_conv_padding = (0, pad_w0)
     else:
-        working = nn.functional.pad(input, self.asymmetric_padding[0], mode=self.asymmetric_padding_mode[0])
-        working = nn.functional.pad(working, self.asymmetric_padding[1], mode=self.asymmetric_padding_mode[1])
-    return nn.functional.conv2d(working, weight, bias, self.stride, nn.modules.utils._pair(0), self.dilation, self.groups)
+        m.asymmetric_padding = (
+            ((pad_w0, pad_w1, 0, 0), m.asymmetric_padding_mode[0]),
+            ((0, 0, pad_h0, pad_h1), m.asymmetric_padding_mode[1])
+        )
+        m.asymmetric_conv_padding = (0, 0)
@@ -0,0 +1,134 @@
+"""
+Sequential CPU offloading that overlaps weight transfers with computation.
+
+Each top level block of a model is its own offloaded unit. While one unit runs, the weights
+of the unit that ran after it last time are copied to the device on a separate CUDA stream,
+so the transfers are hidden behind the computation instead of stalling before every block.
+"""
+import torch
+from accelerate.hooks import ModelHook, add_hook_to_module
+from accelerate.utils import send_to_device
+
+
+class _ExecutionDeviceHook(ModelHook):
+    # `execution_device` is what `DiffusionPipeline._execution_device` looks for to find where inputs should be made
+    def __init__(self, execution_device):
+        self.execution_device = execution_device
+
+    def pre_forward(self, module, *args, **kwargs):
+        return send_to_device(args, self.execution_device), send_to_device(kwargs, self.execution_device)
+
+
+class _Unit:
+    def __init__(self, module):
+        self.slots = []
+        for submodule in module.modules():
+            for name, param in submodule._parameters.items():
+                if param is not None:
+                    self.slots.append((submodule, name, True))
+            for name, buffer in submodule._buffers.items():
+                if buffer is not None:
+                    self.slots.append((submodule, name, False))
+        self.host_tensors = None
+        self.device_tensors = None
+        self.event = None
+
+    def _get(self, slot):
+        module, name, is_param = slot
+        return module._parameters[name].data if is_param else module._buffers[name]
+
+    def _set(self, slot, tensor):
+        module, name, is_param = slot
+        if is_param:
+            module._parameters[name].data = tensor
+        else:
+            module._buffers[name] = tensor
+
+
+class _UnitHook(ModelHook):
+    def __init__(self, offload, unit):
+        self.offload = offload
+        self.unit = unit
+
+    def pre_forward(self, module, *args, **kwargs):
+        self.offload.load(self.unit)
+        return args, kwargs
+
+    def post_forward(self, module, output):
+        self.offload.unload(self.unit)
+        return output
+
+
+class _PrefetchOffload:
+    def __init__(self, device):
+        self.device = torch.device(device)
+        self.prefetch_stream = torch.cuda.Stream(self.device)
+        # units in the order they ran, the prefetch schedule is learned from the first forward pass
+        self.order = []
+        self.position = {}
+
+    def prefetch(self, unit, stream):
+        if unit.device_tensors is not None:
+            return
+        host_tensors = []
+        for slot in unit.slots:
+            tensor = unit._get(slot)
+            if not tensor.is_pinned():
+                # pinned once, the pinned copy is put back into the module when the unit is unloaded
+                try:
+                    tensor = tensor.pin_memory()
+                except RuntimeError:
+                    pass
+            host_tensors.append(tensor)
+        with torch.cuda.stream(stream):
+            unit.device_tensors = [tensor.to(self.device, non_blocking=True) for tensor in host_tensors]
+        unit.host_tensors = host_tensors
+        unit.event = stream.record_event()
+
+    def load(self, unit):
+        compute_stream = torch.cuda.current_stream(self.device)
+        if unit not in self.position:
+            self.position[unit] = len(self.order)
+            self.order.append(unit)
+        self.prefetch(unit, compute_stream)
+        compute_stream.wait_event(unit.event)
+        for slot, tensor in zip(unit.slots, unit.device_tensors):
+            # keeps the allocator from reusing the memory on the prefetch stream while this stream still reads it
+            tensor.record_stream(compute_stream)
+            unit._set(slot, tensor)
+
+        # wraps around to the first unit so the next step's weights are already on their way
+        next_unit = self.order[(self.position[unit] + 1) % len(self.order)]
+        if next_unit is not unit:
+            self.prefetch(next_unit, self.prefetch_stream)
+
+    def unload(self, unit):
+        # weights are never modified during inference, so the host copy is still current and nothing needs copying back
+        for slot, tensor in zip(unit.slots, unit.host_tensors):
+            unit._set(slot, tensor)
+        unit.host_tensors = None
+        unit.device_tensors = None
+        unit.event = None
+
+
+def enable(model, device):
+    """
+    Offload `model` to the CPU, moving each of its top level blocks onto `device` only while it runs.
+    """
+    offload = _PrefetchOffload(device)
+    for child in model.children():
+        # containers like `down_blocks` don't run themselves, so their blocks are offloaded individually
+        blocks = list(child) if isinstance(child, (torch.nn.ModuleList, torch.nn.Sequential)) else [child]
+        for block in blocks:
+            unit = _Unit(block)
+            if len(unit.slots) > 0:
+                add_hook_to_module(block, _UnitHook(offload, unit), append=True)
+
+    # tensors registered directly on the model are small enough to stay on the device
+    for name, param in model._parameters.items():
+        if param is not None:
+            param.data = param.data.to(offload.device)
+    for name, buffer in model._buffers.items():
+        if buffer is not None:
+            model._buffers[name] = buffer.to(offload.device)
+    add_hook_to_module(model, _ExecutionDeviceHook(offload.device), append=True)